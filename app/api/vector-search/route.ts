@@ -42,7 +42,7 @@ export async function POST(req: NextRequest) {
     // Filter by subject/topic/content_type if provided
     let results = data || []
     if (subject) results = results.filter((r: any) => r.subject === subject)
-    if (topic) results = results.filter((r: any) => r.topic === topic)
+    if (topic) results = results.filter((r: any) => r.topics?.includes(topic))
     if (content_type) results = results.filter((r: any) => r.content_type === content_type)
     
     return NextResponse.json({ 
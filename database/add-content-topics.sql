@@ -0,0 +1,94 @@
+-- Migration: Store chunk topics as an array column on csec_content
+-- Run this in Supabase SQL Editor BEFORE re-running bulk_populate_vectors.py
+--
+-- bulk_populate_vectors.py used to insert one row per (chunk, topic) pair,
+-- duplicating the content and embedding for every topic. It now inserts one
+-- row per chunk with all detected topics in `topics`; `topic` keeps the
+-- primary (first) topic for existing readers.
+--
+-- Safe to run before or after migrate-to-halfvec.sql: the search function is
+-- recreated to match whatever type csec_content.embedding currently has.
+
+BEGIN;
+
+-- 1. Add topics column and backfill from the existing single-topic column
+ALTER TABLE csec_content
+ADD COLUMN IF NOT EXISTS topics TEXT[] NOT NULL DEFAULT '{}';
+
+UPDATE csec_content SET topics = ARRAY[topic] WHERE topics = '{}';
+
+-- 2. GIN index for topic containment filters (topics @> ARRAY['algebra'])
+CREATE INDEX IF NOT EXISTS idx_csec_content_topics ON csec_content USING GIN (topics);
+
+-- 3. Writers that only set `topic` (the TypeScript populate scripts) still get
+--    a matching `topics` array
+CREATE OR REPLACE FUNCTION sync_csec_content_topics()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.topics IS NULL OR NEW.topics = '{}' THEN
+    NEW.topics = ARRAY[NEW.topic];
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS sync_csec_content_topics ON csec_content;
+CREATE TRIGGER sync_csec_content_topics BEFORE INSERT ON csec_content
+  FOR EACH ROW EXECUTE FUNCTION sync_csec_content_topics();
+
+-- 4. Recreate search function so results include topics. The query embedding
+--    is cast to the column's type (vector or halfvec) so the index is used.
+DROP FUNCTION IF EXISTS search_csec_content;
+
+DO $migration$
+DECLARE
+  embedding_type TEXT;
+BEGIN
+  SELECT format_type(atttypid, atttypmod) INTO embedding_type
+  FROM pg_attribute
+  WHERE attrelid = 'csec_content'::regclass AND attname = 'embedding';
+
+  EXECUTE format($function$
+    CREATE OR REPLACE FUNCTION search_csec_content(
+      query_embedding vector(384),
+      match_threshold float DEFAULT 0.5,
+      match_count int DEFAULT 10
+    )
+    RETURNS TABLE(
+      id UUID,
+      subject TEXT,
+      topic TEXT,
+      topics TEXT[],
+      subtopic TEXT,
+      content_type TEXT,
+      content TEXT,
+      metadata JSONB,
+      similarity float
+    ) LANGUAGE plpgsql AS $body$
+    BEGIN
+      RETURN QUERY
+      SELECT
+        c.id,
+        c.subject,
+        c.topic,
+        c.topics,
+        c.subtopic,
+        c.content_type,
+        c.content,
+        c.metadata,
+        1 - (c.embedding <=> query_embedding::%1$s) as similarity
+      FROM csec_content c
+      WHERE c.embedding IS NOT NULL
+        AND 1 - (c.embedding <=> query_embedding::%1$s) > match_threshold
+      ORDER BY similarity DESC
+      LIMIT match_count;
+    END;
+    $body$;
+  $function$, embedding_type);
+END
+$migration$;
+
+COMMIT;
+
+-- Verification
+SELECT 'Migration complete. csec_content.topics added' as status;
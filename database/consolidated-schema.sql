@@ -4,7 +4,8 @@
 -- Merge of: schema.sql, add-metrics-tables.sql, add-content-tables.sql,
 --   add-missing-columns.sql, add-wizard-data.sql, admin-schema.sql,
 --   fix-rls-policies.sql, fix-user-id-type.sql, migrate-to-384-dim.sql,
---   rebuild-vector-index.sql, update-rls.sql
+--   rebuild-vector-index.sql, update-rls.sql, add-content-topics.sql,
+--   migrate-to-halfvec.sql
 --
 -- This file is the SINGLE SOURCE OF TRUTH for the database schema.
 -- Individual migration files are kept for history only.
@@ -23,6 +24,17 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Fill csec_content.topics from topic for writers that only set the single-topic column
+CREATE OR REPLACE FUNCTION sync_csec_content_topics()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.topics IS NULL OR NEW.topics = '{}' THEN
+    NEW.topics = ARRAY[NEW.topic];
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================================
 -- 2. CORE TABLES
 -- ============================================================
@@ -72,14 +84,33 @@ CREATE TABLE IF NOT EXISTS csec_content (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   subject TEXT NOT NULL,
   topic TEXT NOT NULL,
+  topics TEXT[] NOT NULL DEFAULT '{}',
   subtopic TEXT NOT NULL,
   content_type TEXT NOT NULL CHECK (content_type IN ('syllabus','question','explanation','example')),
   content TEXT NOT NULL,
   metadata JSONB DEFAULT '{}',
-  embedding vector(384),
+  embedding halfvec(384),
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Tables created before topic arrays: add and backfill topics from topic
+ALTER TABLE csec_content ADD COLUMN IF NOT EXISTS topics TEXT[] NOT NULL DEFAULT '{}';
+UPDATE csec_content SET topics = ARRAY[topic] WHERE topics = '{}';
+
+-- Tables created with vector(384) embeddings: convert to halfvec(384) in place.
+-- The vector index cannot be rebuilt with a halfvec column, so it is recreated.
+DO $$
+BEGIN
+  IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+      WHERE attrelid = 'csec_content'::regclass AND attname = 'embedding') <> 'halfvec(384)' THEN
+    DROP INDEX IF EXISTS idx_csec_content_embedding;
+    ALTER TABLE csec_content
+    ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+    CREATE INDEX idx_csec_content_embedding ON csec_content USING hnsw (embedding halfvec_cosine_ops);
+  END IF;
+END
+$$;
+
 -- ============================================================
 -- 4. METRICS TABLES
 -- ============================================================
@@ -230,6 +261,7 @@ CREATE INDEX IF NOT EXISTS idx_progress_plan_id ON progress(plan_id);
 -- Vector content
 CREATE INDEX IF NOT EXISTS idx_csec_content_subject ON csec_content(subject);
 CREATE INDEX IF NOT EXISTS idx_csec_content_topic ON csec_content(topic);
+CREATE INDEX IF NOT EXISTS idx_csec_content_topics ON csec_content USING GIN (topics);
 CREATE INDEX IF NOT EXISTS idx_csec_content_type ON csec_content(content_type);
 
 -- Metrics
@@ -260,23 +292,25 @@ CREATE INDEX IF NOT EXISTS idx_ai_usage_action ON ai_usage(action);
 -- 8. VECTOR SEARCH FUNCTION
 -- ============================================================
 
+-- Dropped first: CREATE OR REPLACE cannot change the return columns of an older version
+DROP FUNCTION IF EXISTS search_csec_content(vector, float, int);
 CREATE OR REPLACE FUNCTION search_csec_content(
   query_embedding vector(384),
   match_threshold float DEFAULT 0.5,
   match_count int DEFAULT 10
 )
 RETURNS TABLE(
-  id UUID, subject TEXT, topic TEXT, subtopic TEXT,
+  id UUID, subject TEXT, topic TEXT, topics TEXT[], subtopic TEXT,
   content_type TEXT, content TEXT, metadata JSONB, similarity float
 ) LANGUAGE plpgsql AS $$
 BEGIN
   RETURN QUERY
-  SELECT c.id, c.subject, c.topic, c.subtopic, c.content_type,
+  SELECT c.id, c.subject, c.topic, c.topics, c.subtopic, c.content_type,
          c.content, c.metadata,
-         1 - (c.embedding <=> query_embedding) as similarity
+         1 - (c.embedding <=> query_embedding::halfvec(384)) as similarity
   FROM csec_content c
   WHERE c.embedding IS NOT NULL
-    AND 1 - (c.embedding <=> query_embedding) > match_threshold
+    AND 1 - (c.embedding <=> query_embedding::halfvec(384)) > match_threshold
   ORDER BY similarity DESC
   LIMIT match_count;
 END;
@@ -370,6 +404,10 @@ DROP TRIGGER IF EXISTS update_user_preferences_updated_at ON user_preferences;
 CREATE TRIGGER update_user_preferences_updated_at BEFORE UPDATE ON user_preferences
   FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS sync_csec_content_topics ON csec_content;
+CREATE TRIGGER sync_csec_content_topics BEFORE INSERT ON csec_content
+  FOR EACH ROW EXECUTE FUNCTION sync_csec_content_topics();
+
 -- ============================================================
 -- 12. ROW LEVEL SECURITY (permissive for demo mode)
 -- ============================================================
@@ -0,0 +1,71 @@
+-- Migration: Store csec_content embeddings as half-precision halfvec(384)
+-- Run this in Supabase SQL Editor BEFORE running bulk_populate_vectors.py
+-- Requires pgvector 0.7.0+ (halfvec type)
+--
+-- bulk_populate_vectors.py now uploads FP16 embeddings. halfvec halves row
+-- and index size versus vector(384) with negligible recall loss for
+-- all-MiniLM-L6-v2. Existing embeddings are converted in place.
+
+BEGIN;
+
+-- 1. Drop existing function and index (both depend on the column type)
+DROP FUNCTION IF EXISTS search_csec_content;
+DROP INDEX IF EXISTS idx_csec_content_embedding;
+
+-- 2. Convert column to half precision
+ALTER TABLE csec_content
+ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+
+-- The search function below returns topics. The column is normally added by
+-- add-content-topics.sql; add it here too so this migration can run first
+-- (still run add-content-topics.sql afterwards for the backfill and trigger).
+ALTER TABLE csec_content
+ADD COLUMN IF NOT EXISTS topics TEXT[] NOT NULL DEFAULT '{}';
+
+-- 3. Recreate vector index with halfvec operator class
+CREATE INDEX idx_csec_content_embedding
+ON csec_content
+USING hnsw (embedding halfvec_cosine_ops);
+
+-- 4. Recreate search function. Callers still pass a vector(384); it is cast
+--    to halfvec so the index is used.
+CREATE OR REPLACE FUNCTION search_csec_content(
+  query_embedding vector(384),
+  match_threshold float DEFAULT 0.5,
+  match_count int DEFAULT 10
+)
+RETURNS TABLE(
+  id UUID,
+  subject TEXT,
+  topic TEXT,
+  topics TEXT[],
+  subtopic TEXT,
+  content_type TEXT,
+  content TEXT,
+  metadata JSONB,
+  similarity float
+) LANGUAGE plpgsql AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    c.id,
+    c.subject,
+    c.topic,
+    c.topics,
+    c.subtopic,
+    c.content_type,
+    c.content,
+    c.metadata,
+    1 - (c.embedding <=> query_embedding::halfvec(384)) as similarity
+  FROM csec_content c
+  WHERE c.embedding IS NOT NULL
+    AND 1 - (c.embedding <=> query_embedding::halfvec(384)) > match_threshold
+  ORDER BY similarity DESC
+  LIMIT match_count;
+END;
+$$;
+
+COMMIT;
+
+-- Verification
+SELECT 'Migration complete. Embeddings stored as halfvec(384)' as status;
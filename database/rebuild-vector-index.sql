@@ -1,5 +1,7 @@
 -- Fix Vector Index for Large Table
 -- Run this in Supabase SQL Editor
+-- Requires migrate-to-halfvec.sql (or consolidated-schema.sql) first: the index
+-- uses halfvec_cosine_ops and fails on a vector(384) embedding column
 
 -- Step 1: Drop the old (broken) index
 DROP INDEX IF EXISTS idx_csec_content_embedding;
@@ -9,7 +11,7 @@ DROP INDEX IF EXISTS idx_csec_content_embedding;
 -- For ~94K rows, optimal is sqrt(94000) ≈ 307, but 100 works within memory limits
 CREATE INDEX idx_csec_content_embedding 
 ON csec_content 
-USING ivfflat (embedding vector_cosine_ops)
+USING ivfflat (embedding halfvec_cosine_ops)
 WITH (lists = 100);
 
 -- Step 3: Analyze the table to update statistics
@@ -50,11 +50,12 @@ CREATE TABLE IF NOT EXISTS csec_content (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   subject TEXT NOT NULL,
   topic TEXT NOT NULL,
+  topics TEXT[] NOT NULL DEFAULT '{}',
   subtopic TEXT NOT NULL,
   content_type TEXT NOT NULL CHECK (content_type IN ('syllabus', 'question', 'explanation', 'example')),
   content TEXT NOT NULL,
   metadata JSONB DEFAULT '{}',
-  embedding vector(384), -- sentence-transformers all-MiniLM-L6-v2 dimension
+  embedding halfvec(384), -- sentence-transformers all-MiniLM-L6-v2 dimension, FP16
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -79,12 +80,13 @@ CREATE INDEX IF NOT EXISTS idx_study_plans_user_id ON study_plans(user_id);
 CREATE INDEX IF NOT EXISTS idx_study_plans_status ON study_plans(status);
 CREATE INDEX IF NOT EXISTS idx_csec_content_subject ON csec_content(subject);
 CREATE INDEX IF NOT EXISTS idx_csec_content_topic ON csec_content(topic);
+CREATE INDEX IF NOT EXISTS idx_csec_content_topics ON csec_content USING GIN (topics);
 CREATE INDEX IF NOT EXISTS idx_csec_content_type ON csec_content(content_type);
 CREATE INDEX IF NOT EXISTS idx_progress_user_id ON progress(user_id);
 CREATE INDEX IF NOT EXISTS idx_progress_plan_id ON progress(plan_id);
 
 -- Create vector index for similarity search
-CREATE INDEX IF NOT EXISTS idx_csec_content_embedding ON csec_content USING ivfflat (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_csec_content_embedding ON csec_content USING ivfflat (embedding halfvec_cosine_ops);
 
 -- Create function for updating updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -105,6 +107,20 @@ CREATE TRIGGER update_study_plans_updated_at BEFORE UPDATE ON study_plans
 CREATE TRIGGER update_progress_updated_at BEFORE UPDATE ON progress
   FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Fill topics from topic for writers that only set the single-topic column
+CREATE OR REPLACE FUNCTION sync_csec_content_topics()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.topics IS NULL OR NEW.topics = '{}' THEN
+    NEW.topics = ARRAY[NEW.topic];
+  END IF;
+  RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER sync_csec_content_topics BEFORE INSERT ON csec_content
+  FOR EACH ROW EXECUTE FUNCTION sync_csec_content_topics();
+
 -- Create search function for vector similarity
 CREATE OR REPLACE FUNCTION search_csec_content(
   query_embedding vector(384),
@@ -115,6 +131,7 @@ RETURNS TABLE(
   id UUID,
   subject TEXT,
   topic TEXT,
+  topics TEXT[],
   subtopic TEXT,
   content_type TEXT,
   content TEXT,
@@ -127,13 +144,14 @@ BEGIN
     c.id,
     c.subject,
     c.topic,
+    c.topics,
     c.subtopic,
     c.content_type,
     c.content,
     c.metadata,
-    1 - (c.embedding <=> query_embedding) as similarity
+    1 - (c.embedding <=> query_embedding::halfvec(384)) as similarity
   FROM csec_content c
-  WHERE 1 - (c.embedding <=> query_embedding) > match_threshold
+  WHERE 1 - (c.embedding <=> query_embedding::halfvec(384)) > match_threshold
   ORDER BY similarity DESC
   LIMIT match_count;
 END;
@@ -63,6 +63,7 @@ export interface Database {
           id: string
           subject: string
           topic: string
+          topics: string[]
           subtopic: string
           content_type: 'syllabus' | 'question' | 'explanation' | 'example'
           content: string
@@ -80,6 +81,7 @@ export interface Database {
           id?: string
           subject: string
           topic: string
+          topics?: string[]
           subtopic: string
           content_type: 'syllabus' | 'question' | 'explanation' | 'example'
           content: string
@@ -97,6 +99,7 @@ export interface Database {
           id?: string
           subject?: string
           topic?: string
+          topics?: string[]
           subtopic?: string
           content_type?: 'syllabus' | 'question' | 'explanation' | 'example'
           content?: string
@@ -9,6 +9,7 @@ export class VectorSearch {
   static async addContent(content: {
     subject: string
     topic: string
+    topics?: string[]
     subtopic: string
     content_type: 'syllabus' | 'question' | 'explanation' | 'example'
     content: string
@@ -20,6 +21,7 @@ export class VectorSearch {
       .from('csec_content')
       .insert({
         ...content,
+        topics: content.topics || [content.topic],
         embedding,
         metadata: content.metadata || {}
       })
@@ -47,7 +49,7 @@ export class VectorSearch {
       })
 
       if (subject) queryBuilder = queryBuilder.eq('subject', subject)
-      if (topic) queryBuilder = queryBuilder.eq('topic', topic)
+      if (topic) queryBuilder = queryBuilder.contains('topics', [topic])
       if (content_type) queryBuilder = queryBuilder.eq('content_type', content_type)
 
       const { data, error } = await queryBuilder
@@ -70,7 +72,7 @@ export class VectorSearch {
       .from('csec_content')
       .select('*')
       .eq('subject', subject)
-      .eq('topic', topic)
+      .contains('topics', [topic])
       .order('created_at', { ascending: true })
 
     if (error) throw error
@@ -92,13 +94,12 @@ export class VectorSearch {
   static async getTopics(subject: string): Promise<string[]> {
     const { data, error } = await supabase
       .from('csec_content')
-      .select('topic')
+      .select('topics')
       .eq('subject', subject)
-      .order('topic')
 
     if (error) throw error
     
-    const topics = [...new Set(data?.map(item => item.topic))]
+    const topics = [...new Set(data?.flatMap(item => item.topics))].sort()
     return topics
   }
 }
\ No newline at end of file
@@ -14,15 +14,26 @@ Usage:
 Requirements:
     - Python 3.9+
     - Supabase credentials in .env or .env.local
+    - (Optional) POSTGRES_URL for direct binary COPY uploads (psycopg + pgvector)
     - PDFs in data/past-papers/{subject}/ and data/syllabi/{subject}/
     - (Optional) Tesseract OCR for scanned documents
 """
 
+import asyncio
+import hashlib
+import importlib.util
+import io
 import os
+import queue
 import re
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 from datetime import datetime
 
 # Load environment variables from .env.local
@@ -38,19 +49,44 @@ else:
     # Try .env as fallback
     load_dotenv(project_root / '.env')
 
-# Now import other dependencies
+# Now import other dependencies. torch, sentence-transformers and supabase are only
+# needed in the main process, so they are imported lazily to keep the PDF worker
+# processes light (spawn start method re-imports this module in every worker)
 import fitz  # PyMuPDF
-from sentence_transformers import SentenceTransformer
-from supabase import create_client, Client
+import numpy as np
 from tqdm import tqdm
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+    from supabase import Client
+
 # Configuration
 EMBEDDING_MODEL = 'all-MiniLM-L6-v2'  # 384 dimensions, fast and effective
 EMBEDDING_DIMENSION = 384
+EMBEDDING_DTYPE = np.float16  # Stored as pgvector halfvec(384)
+EMBEDDING_ONNX_FILE = 'onnx/model_qint8_avx512_vnni.onnx'  # Dynamic int8 export shipped with the model
+PDF_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP  # Expand ligatures, collapse whitespace, clip to page
 CHUNK_SIZE = 500  # Characters per chunk
 CHUNK_OVERLAP = 100  # Overlap between chunks
 MIN_CHUNK_SIZE = 50  # Skip very small chunks
-BATCH_SIZE = 50  # Upsert batch size
+BATCH_SIZE = 200  # Upsert batch size
+UPLOAD_CONCURRENCY = 8  # Concurrent REST insert requests
+COPY_COLUMNS = ('subject', 'topic', 'topics', 'subtopic', 'content_type', 'content', 'metadata', 'embedding')
+COPY_TYPES = ('text', 'text', 'text[]', 'text', 'text', 'text', 'jsonb', 'halfvec')
+ENCODE_BATCH_SIZE = 64  # Chunks per model.encode forward pass
+EMBEDDING_THREADS = min(8, os.cpu_count() or 1)  # Torch intra-op threads; 4-8 is the CPU sweet spot
+EMBED_FLUSH_SIZE = 512  # Chunks accumulated across PDFs before each encode call
+UPLOAD_QUEUE_SIZE = 4  # Embedded batches buffered ahead of the uploader thread
+INGEST_CONCURRENCY = int(os.getenv('INGEST_CONCURRENCY', os.cpu_count() or 1))  # PDF worker processes
+# Tesseract pages OCR'd at once per worker process. Workers x OCR_CONCURRENCY bounds the
+# Tesseract subprocesses alive at once, so the default splits the CPUs across workers.
+OCR_CONCURRENCY = int(os.getenv('OCR_CONCURRENCY', max(1, (os.cpu_count() or 1) // INGEST_CONCURRENCY)))
+# OpenMP threads per Tesseract; parallelism comes from concurrent pages. Applied only in
+# worker processes so torch's OpenMP pool in the main process is not capped.
+OCR_THREAD_LIMIT = os.getenv('OMP_THREAD_LIMIT', '1')
+# Poppler threads rasterizing pages before OCR, per worker process; split across workers
+# like OCR_CONCURRENCY so workers x threads stays within the CPU count
+OCR_RENDER_THREADS = int(os.getenv('OCR_RENDER_THREADS', max(1, min(4, (os.cpu_count() or 1) // INGEST_CONCURRENCY))))
 
 # Subject name normalization
 SUBJECT_ALIASES = {
@@ -108,9 +144,67 @@ SUBJECT_ALIASES = {
     'religious-education': 'Religious Education',
 }
 
+# Aliases keyed by their normalized folder form, with interned canonical names
+CANON_MAP = {
+    alias.lower().replace('_', '-').replace(' ', '-'): sys.intern(canonical)
+    for alias, canonical in SUBJECT_ALIASES.items()
+}
+
+# Subject-specific topic detection
+TOPIC_KEYWORDS = {
+    'Mathematics': [
+        ('algebra', ['algebra', 'equation', 'polynomial', 'factori', 'quadratic']),
+        ('geometry', ['geometry', 'triangle', 'circle', 'angle', 'polygon', 'theorem']),
+        ('trigonometry', ['trigonometry', 'sine', 'cosine', 'tangent', 'pythagor']),
+        ('statistics', ['statistics', 'mean', 'median', 'mode', 'probability', 'data']),
+        ('calculus', ['calculus', 'differentiat', 'integrat', 'derivative']),
+        ('sets', ['sets', 'venn diagram', 'union', 'intersection']),
+        ('functions', ['function', 'domain', 'range', 'mapping']),
+        ('vectors', ['vector', 'scalar', 'magnitude', 'direction']),
+        ('matrices', ['matrix', 'matrices', 'determinant']),
+        ('mensuration', ['area', 'volume', 'surface area', 'perimeter']),
+    ],
+    'Biology': [
+        ('cells', ['cell', 'membrane', 'nucleus', 'mitochondri', 'cytoplasm']),
+        ('genetics', ['gene', 'dna', 'chromosome', 'heredit', 'mutation']),
+        ('ecology', ['ecology', 'ecosystem', 'food chain', 'habitat', 'biodiversity']),
+        ('human biology', ['human body', 'organ', 'digest', 'circulat', 'respir']),
+        ('plant biology', ['photosynthesis', 'plant', 'chlorophyll', 'transpir']),
+        ('evolution', ['evolution', 'natural selection', 'adaptation', 'species']),
+    ],
+    'Chemistry': [
+        ('atomic structure', ['atom', 'electron', 'proton', 'neutron', 'isotope']),
+        ('bonding', ['bond', 'ionic', 'covalent', 'metallic']),
+        ('reactions', ['reaction', 'equation', 'product', 'reactant']),
+        ('acids and bases', ['acid', 'base', 'ph', 'neutrali']),
+        ('organic chemistry', ['organic', 'hydrocarbon', 'alkane', 'alkene']),
+        ('electrochemistry', ['electrolysis', 'electrode', 'electrolyte']),
+    ],
+    'Physics': [
+        ('mechanics', ['force', 'motion', 'velocity', 'acceleration', 'momentum']),
+        ('waves', ['wave', 'frequency', 'wavelength', 'sound', 'light']),
+        ('electricity', ['electric', 'current', 'voltage', 'resistance', 'circuit']),
+        ('magnetism', ['magnet', 'magnetic field', 'electromagnet']),
+        ('heat', ['heat', 'temperature', 'thermal', 'conduction', 'convection']),
+        ('energy', ['energy', 'kinetic', 'potential', 'conservation']),
+    ],
+}
+
 
-def get_supabase_client() -> Client:
+# Embeddings of chunks already encoded this run, keyed by content hash. Past papers
+# and syllabi repeat boilerplate (instructions, cover pages), so repeats skip the model.
+CHUNK_CACHE: dict[bytes, np.ndarray] = {}
+
+# Precompiled patterns
+YEAR_RE = re.compile(r'(19|20)\d{2}')
+PAPER_RE = re.compile(r'p(?:aper)?[_\-\s]?([123])|paper[_\-\s]?([123])')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def get_supabase_client() -> 'Client':
     """Initialize Supabase client from environment variables."""
+    from supabase import create_client
+    
     url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
     key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
     
@@ -122,29 +216,82 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
-def load_embedding_model() -> SentenceTransformer:
-    """Load the sentence-transformers model."""
+def get_postgres_connection():
+    """Open a direct Postgres connection for COPY uploads, if POSTGRES_URL is set."""
+    url = os.getenv('POSTGRES_URL')
+    if not url:
+        return None
+    
+    try:
+        import psycopg
+        from pgvector.psycopg import register_vector
+    except ImportError:
+        print("Warning: POSTGRES_URL set but psycopg/pgvector not installed, using Supabase REST")
+        return None
+    
+    try:
+        conn = psycopg.connect(url)
+        register_vector(conn)
+        return conn
+    except Exception as e:
+        print(f"Warning: Could not connect to Postgres ({e}), using Supabase REST")
+        return None
+
+
+def load_embedding_model() -> 'SentenceTransformer':
+    """Load the sentence-transformers model, preferring the int8 ONNX export on CPU."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
     print(f"Loading embedding model: {EMBEDDING_MODEL}...")
-    model = SentenceTransformer(EMBEDDING_MODEL)
-    print(f"Model loaded. Embedding dimension: {model.get_sentence_embedding_dimension()}")
+    torch.set_num_threads(EMBEDDING_THREADS)
+    # Encode (and normalize) on GPU when present
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = None
+    
+    # The int8 ONNX export is a CPU optimization; on a GPU run the PyTorch model there
+    if device == 'cpu' and '--no-quantize' not in sys.argv:
+        try:
+            # Same tokenizer, mean pooling and normalization as the PyTorch model,
+            # but matmuls run through ONNX Runtime's int8 kernels
+            model = SentenceTransformer(
+                EMBEDDING_MODEL,
+                backend='onnx',
+                model_kwargs={'file_name': EMBEDDING_ONNX_FILE}
+            )
+            print(f"Using int8 ONNX backend: {EMBEDDING_ONNX_FILE}")
+        except Exception as e:
+            print(f"Warning: int8 ONNX model unavailable ({e}), falling back to PyTorch")
+    
+    if model is None:
+        model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+        if '--speedup' in sys.argv:
+            # Compile the transformer forward; dynamic shapes since batch lengths vary
+            model[0].auto_model = torch.compile(model[0].auto_model, mode='reduce-overhead', dynamic=True)
+            print("Compiled transformer with torch.compile")
+    elif '--speedup' in sys.argv:
+        print("Warning: --speedup only applies to the PyTorch backend; pass --no-quantize to compile on CPU")
+    
+    print(f"Model loaded on {model.device}. Embedding dimension: {model.get_sentence_embedding_dimension()}")
     return model
 
 
+@lru_cache(maxsize=None)
 def normalize_subject(folder_name: str) -> str:
     """Normalize subject name from folder name."""
     key = folder_name.lower().strip().replace('_', '-').replace(' ', '-')
     
     # Check direct alias match
-    if key in SUBJECT_ALIASES:
-        return SUBJECT_ALIASES[key]
+    if key in CANON_MAP:
+        return CANON_MAP[key]
     
-    # Try partial matches
-    for alias, canonical in SUBJECT_ALIASES.items():
+    # Try partial matches (only reached once per unknown folder name thanks to the cache)
+    for alias, canonical in CANON_MAP.items():
         if alias in key or key in alias:
             return canonical
     
     # Fallback: title case the folder name
-    return folder_name.replace('-', ' ').replace('_', ' ').title()
+    return sys.intern(folder_name.replace('-', ' ').replace('_', ' ').title())
 
 
 def extract_metadata_from_filename(filename: str, content_type: str) -> dict:
@@ -152,12 +299,12 @@ def extract_metadata_from_filename(filename: str, content_type: str) -> dict:
     metadata = {'source': filename, 'content_type': content_type}
     
     # Try to extract year
-    year_match = re.search(r'(19|20)\d{2}', filename)
+    year_match = YEAR_RE.search(filename)
     if year_match:
         metadata['year'] = int(year_match.group())
     
     # Try to extract paper number
-    paper_match = re.search(r'p(?:aper)?[_\-\s]?([123])|paper[_\-\s]?([123])', filename.lower())
+    paper_match = PAPER_RE.search(filename.lower())
     if paper_match:
         metadata['paper'] = int(paper_match.group(1) or paper_match.group(2))
     
@@ -170,23 +317,33 @@ def extract_metadata_from_filename(filename: str, content_type: str) -> dict:
     return metadata
 
 
+def join_pages(page_texts: Iterable[str]) -> str:
+    """Join non-empty page texts under [Page N] headers, building the result in one buffer."""
+    buffer = io.StringIO()
+    write = buffer.write
+    
+    for page_num, text in enumerate(page_texts, 1):
+        if not text.strip():
+            continue
+        if buffer.tell():
+            write('\n\n')
+        write('[Page ')
+        write(str(page_num))
+        write(']\n')
+        write(text)
+    
+    return buffer.getvalue()
+
+
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """Extract text from PDF using PyMuPDF. Falls back to OCR if needed."""
     try:
         doc = fitz.open(pdf_path)
-        text_parts = []
-        
-        for page_num, page in enumerate(doc):
-            text = page.get_text()
-            if text.strip():
-                text_parts.append(f"[Page {page_num + 1}]\n{text}")
-        
+        full_text = join_pages(page.get_text('text', flags=PDF_TEXT_FLAGS, sort=False) for page in doc)
         doc.close()
         
-        full_text = '\n\n'.join(text_parts)
-        
         # If we got very little text, try OCR
-        if len(full_text.strip()) < 100:
+        if len(full_text) < 100:
             ocr_text = try_ocr_extraction(pdf_path)
             if ocr_text and len(ocr_text) > len(full_text):
                 return ocr_text
@@ -200,20 +357,25 @@ def extract_text_from_pdf(pdf_path: Path) -> str:
 
 def try_ocr_extraction(pdf_path: Path) -> str:
     """Attempt OCR extraction for scanned PDFs."""
+    if importlib.util.find_spec('aiopytesseract') is None:
+        # OCR dependencies not installed
+        return ""
+    
     try:
-        import pytesseract
         from pdf2image import convert_from_path
         
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=150)
-        text_parts = []
-        
-        for i, image in enumerate(images):
-            text = pytesseract.image_to_string(image)
-            if text.strip():
-                text_parts.append(f"[Page {i + 1}]\n{text}")
-        
-        return '\n\n'.join(text_parts)
+        # Convert PDF to lossless PNG files; Tesseract reads them from disk, so pages are
+        # never decoded into memory on our side
+        with tempfile.TemporaryDirectory() as output_folder:
+            image_paths = convert_from_path(
+                pdf_path,
+                dpi=150,
+                thread_count=OCR_RENDER_THREADS,
+                fmt='png',
+                output_folder=output_folder,
+                paths_only=True
+            )
+            return join_pages(asyncio.run(_ocr_all(image_paths)))
     
     except ImportError:
         # OCR dependencies not installed
@@ -223,13 +385,37 @@ def try_ocr_extraction(pdf_path: Path) -> str:
         return ""
 
 
+async def _ocr_all(image_paths: list[str]) -> list[str]:
+    """Run Tesseract over all page image files concurrently, preserving page order."""
+    import aiopytesseract
+    
+    semaphore = asyncio.Semaphore(OCR_CONCURRENCY)
+    
+    async def ocr_page(image_path: str) -> str:
+        async with semaphore:
+            return await aiopytesseract.image_to_string(image_path)
+    
+    return await asyncio.gather(*(ocr_page(image_path) for image_path in image_paths))
+
+
+def sentence_boundaries(text: str) -> np.ndarray:
+    """Offsets just past every '.', '?' or '!' followed by a space, in one vectorized pass."""
+    # UTF-32 gives one element per character, so array indices are string offsets
+    codes = np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.uint32)
+    is_end = (codes == ord('.')) | (codes == ord('?')) | (codes == ord('!'))
+    is_space = codes == ord(' ')
+    return np.flatnonzero(is_end[:-1] & is_space[1:]) + 1
+
+
 def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
     """Split text into overlapping chunks for embedding."""
     if not text or len(text.strip()) < MIN_CHUNK_SIZE:
         return []
     
     # Clean text
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
+    
+    boundaries = sentence_boundaries(text)
     
     chunks = []
     start = 0
@@ -239,13 +425,10 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
         
         # Try to break at sentence boundary
         if end < len(text):
-            # Look for sentence end within last 100 chars of chunk
-            search_start = max(end - 100, start)
-            for punct in ['. ', '.\n', '? ', '!\n']:
-                last_period = text.rfind(punct, search_start, end)
-                if last_period > start:
-                    end = last_period + 1
-                    break
+            # Last sentence end within last 100 chars of chunk
+            j = np.searchsorted(boundaries, end - 1, side='right') - 1
+            if j >= 0 and boundaries[j] >= end - 99 and boundaries[j] > start + 1:
+                end = int(boundaries[j])
         
         chunk = text[start:end].strip()
         if len(chunk) >= MIN_CHUNK_SIZE:
@@ -258,108 +441,147 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
     return chunks
 
 
-def detect_topics(text: str, subject: str) -> list[str]:
-    """Detect topics mentioned in the text based on subject."""
-    topics = set()
-    text_lower = text.lower()
-    
-    # Subject-specific topic detection
-    topic_keywords = {
-        'Mathematics': [
-            ('algebra', ['algebra', 'equation', 'polynomial', 'factori', 'quadratic']),
-            ('geometry', ['geometry', 'triangle', 'circle', 'angle', 'polygon', 'theorem']),
-            ('trigonometry', ['trigonometry', 'sine', 'cosine', 'tangent', 'pythagor']),
-            ('statistics', ['statistics', 'mean', 'median', 'mode', 'probability', 'data']),
-            ('calculus', ['calculus', 'differentiat', 'integrat', 'derivative']),
-            ('sets', ['sets', 'venn diagram', 'union', 'intersection']),
-            ('functions', ['function', 'domain', 'range', 'mapping']),
-            ('vectors', ['vector', 'scalar', 'magnitude', 'direction']),
-            ('matrices', ['matrix', 'matrices', 'determinant']),
-            ('mensuration', ['area', 'volume', 'surface area', 'perimeter']),
-        ],
-        'Biology': [
-            ('cells', ['cell', 'membrane', 'nucleus', 'mitochondri', 'cytoplasm']),
-            ('genetics', ['gene', 'dna', 'chromosome', 'heredit', 'mutation']),
-            ('ecology', ['ecology', 'ecosystem', 'food chain', 'habitat', 'biodiversity']),
-            ('human biology', ['human body', 'organ', 'digest', 'circulat', 'respir']),
-            ('plant biology', ['photosynthesis', 'plant', 'chlorophyll', 'transpir']),
-            ('evolution', ['evolution', 'natural selection', 'adaptation', 'species']),
-        ],
-        'Chemistry': [
-            ('atomic structure', ['atom', 'electron', 'proton', 'neutron', 'isotope']),
-            ('bonding', ['bond', 'ionic', 'covalent', 'metallic']),
-            ('reactions', ['reaction', 'equation', 'product', 'reactant']),
-            ('acids and bases', ['acid', 'base', 'ph', 'neutrali']),
-            ('organic chemistry', ['organic', 'hydrocarbon', 'alkane', 'alkene']),
-            ('electrochemistry', ['electrolysis', 'electrode', 'electrolyte']),
-        ],
-        'Physics': [
-            ('mechanics', ['force', 'motion', 'velocity', 'acceleration', 'momentum']),
-            ('waves', ['wave', 'frequency', 'wavelength', 'sound', 'light']),
-            ('electricity', ['electric', 'current', 'voltage', 'resistance', 'circuit']),
-            ('magnetism', ['magnet', 'magnetic field', 'electromagnet']),
-            ('heat', ['heat', 'temperature', 'thermal', 'conduction', 'convection']),
-            ('energy', ['energy', 'kinetic', 'potential', 'conservation']),
-        ],
-    }
-    
-    if subject in topic_keywords:
-        for topic, keywords in topic_keywords[subject]:
-            for keyword in keywords:
-                if keyword in text_lower:
-                    topics.add(topic)
-                    break
-    
-    return list(topics) if topics else ['General']
-
-
-def process_pdf(
+def detect_topics(text_lower: str, subject: str) -> list[str]:
+    """Detect topics mentioned in already-lowercased text based on subject."""
+    # any() stops at a topic's first matching keyword; declaration order keeps
+    # the primary topic (topics[0]) stable across runs
+    topics = [
+        topic for topic, keywords in TOPIC_KEYWORDS.get(subject, ())
+        if any(keyword in text_lower for keyword in keywords)
+    ]
+    
+    return topics or ['General']
+
+
+def init_extract_worker():
+    """Configure a PDF worker process; Tesseract subprocesses inherit its environment."""
+    os.environ['OMP_THREAD_LIMIT'] = OCR_THREAD_LIMIT
+
+
+def extract_and_chunk(
     pdf_path: Path,
     subject: str,
-    content_type: str,
-    model: SentenceTransformer
-) -> list[dict]:
-    """Process a single PDF and return content records with embeddings."""
-    records = []
-    
+    content_type: str
+) -> tuple[list[str], list[str], dict]:
+    """Extract, chunk and tag a single PDF. Runs in a worker process (no model needed)."""
     # Extract text
     text = extract_text_from_pdf(pdf_path)
     if not text:
         print(f"  Skipping {pdf_path.name}: no text extracted")
-        return records
+        return [], [], {}
     
     # Get metadata
     metadata = extract_metadata_from_filename(pdf_path.name, content_type)
     
     # Detect topics
-    topics = detect_topics(text, subject)
+    topics = detect_topics(text.lower(), subject)
     
     # Chunk text
     chunks = chunk_text(text)
     
     if not chunks:
         print(f"  Skipping {pdf_path.name}: no valid chunks")
-        return records
-    
-    # Generate embeddings for all chunks at once (batch processing)
-    embeddings = model.encode(chunks, show_progress_bar=False)
     
-    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-        for topic in topics:
-            records.append({
-                'subject': subject,
-                'topic': topic,
-                'subtopic': f"Chunk {i + 1}",
-                'content_type': content_type,
-                'content': chunk,
-                'metadata': {**metadata, 'chunk_index': i, 'total_chunks': len(chunks)},
-                'embedding': embedding.tolist()
-            })
-    
-    return records
+    return chunks, topics, metadata
 
 
-def clear_existing_content(supabase: Client):
+def encode_chunks(model: 'SentenceTransformer', chunks: list[str]) -> np.ndarray:
+    """Embed chunks in length-sorted order so each batch pads to similar lengths."""
+    if not chunks:
+        return np.empty((0, EMBEDDING_DIMENSION), dtype=EMBEDDING_DTYPE)
+    
+    # Smart batching: sort by length, encode, then scatter back to original order
+    lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+    perm = np.argsort(lengths, kind='stable')
+    sorted_embeddings = model.encode(
+        [chunks[i] for i in perm],
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    
+    embeddings = np.empty(sorted_embeddings.shape, dtype=EMBEDDING_DTYPE)
+    embeddings[perm] = sorted_embeddings
+    return embeddings
+
+
+def encode_chunks_cached(model: 'SentenceTransformer', chunks: list[str]) -> np.ndarray:
+    """Embed chunks, encoding only text not already seen in this run."""
+    keys = [hashlib.blake2b(chunk.encode(), digest_size=16).digest() for chunk in chunks]
+    
+    novel = {}
+    for key, chunk in zip(keys, chunks):
+        if key not in CHUNK_CACHE:
+            novel.setdefault(key, chunk)
+    
+    if novel:
+        embeddings = encode_chunks(model, list(novel.values()))
+        CHUNK_CACHE.update(zip(novel.keys(), embeddings))
+    
+    if not keys:
+        return np.empty((0, EMBEDDING_DIMENSION), dtype=EMBEDDING_DTYPE)
+    return np.stack([CHUNK_CACHE[key] for key in keys])
+
+
+@dataclass
+class ChunkTable:
+    """Column-oriented batch of csec_content rows. Row i of embedding belongs to chunk i."""
+    embedding: np.ndarray
+    subject: list[str] = field(default_factory=list)
+    topic: list[str] = field(default_factory=list)
+    topics: list[list[str]] = field(default_factory=list)
+    subtopic: list[str] = field(default_factory=list)
+    content_type: list[str] = field(default_factory=list)
+    content: list[str] = field(default_factory=list)
+    metadata: list[dict] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.content)
+    
+    def add_pdf(self, chunks: list[str], topics: list[str], metadata: dict, subject: str, content_type: str):
+        """Append one row per chunk of a PDF; all topics share the chunk's content and embedding."""
+        count = len(chunks)
+        if not count:
+            return
+        self.subject.extend([subject] * count)
+        self.topic.extend([topics[0]] * count)
+        self.topics.extend([topics] * count)
+        self.subtopic.extend(f"Chunk {i + 1}" for i in range(count))
+        self.content_type.extend([content_type] * count)
+        self.content.extend(chunks)
+        self.metadata.extend({**metadata, 'chunk_index': i, 'total_chunks': count} for i in range(count))
+    
+    def rows(self, start: int = 0, stop: Optional[int] = None):
+        """Yield rows as tuples in COPY_COLUMNS order."""
+        columns = (
+            self.subject, self.topic, self.topics, self.subtopic,
+            self.content_type, self.content, self.metadata, self.embedding
+        )
+        for i in range(start, len(self) if stop is None else stop):
+            yield tuple(column[i] for column in columns)
+    
+    def to_dicts(self, start: int, stop: int) -> list[dict]:
+        """Build JSON-ready dicts for a slice of rows (REST inserts only)."""
+        return [
+            {**dict(zip(COPY_COLUMNS, row)), 'embedding': row[-1].tolist()}
+            for row in self.rows(start, stop)
+        ]
+
+
+def embed_pending(model: 'SentenceTransformer', pending: list[tuple]) -> ChunkTable:
+    """Embed the chunks of several extracted PDFs together and pack them into a table."""
+    all_chunks = [chunk for _, _, chunks, _, _ in pending for chunk in chunks]
+    
+    # Chunks are embedded in the same order they are appended, so the matrix is the column
+    table = ChunkTable(embedding=encode_chunks_cached(model, all_chunks))
+    for subject, content_type, chunks, topics, metadata in pending:
+        table.add_pdf(chunks, topics, metadata, subject, content_type)
+    
+    return table
+
+
+def clear_existing_content(supabase: 'Client'):
     """Clear existing content from the table."""
     print("Clearing existing content...")
     try:
@@ -369,24 +591,97 @@ def clear_existing_content(supabase: Client):
         print(f"Warning: Could not clear existing content: {e}")
 
 
-def upsert_records(supabase: Client, records: list[dict]):
+def insert_batch(supabase: 'Client', table: ChunkTable, start: int, stop: int):
+    """Insert one batch of rows, retrying one by one if the batch fails."""
+    # REST inserts need JSON, so dicts and lists are only materialized per batch here
+    batch = table.to_dicts(start, stop)
+    try:
+        supabase.table('csec_content').insert(batch).execute()
+    except Exception as e:
+        print(f"  Error upserting batch: {e}")
+        # Try one by one
+        for record in batch:
+            try:
+                supabase.table('csec_content').insert(record).execute()
+            except Exception as e2:
+                print(f"  Error upserting record: {e2}")
+
+
+def upsert_records(supabase: 'Client', table: ChunkTable):
     """Batch upsert records to Supabase."""
-    if not records:
+    if not len(table):
         return
     
-    # Upload in batches
-    for i in range(0, len(records), BATCH_SIZE):
-        batch = records[i:i + BATCH_SIZE]
+    # Upload batches concurrently over the client's shared HTTP connection pool
+    with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(insert_batch, supabase, table, i, min(i + BATCH_SIZE, len(table)))
+            for i in range(0, len(table), BATCH_SIZE)
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+
+def copy_records(conn, table: ChunkTable) -> bool:
+    """Stream rows into csec_content with a binary COPY. Returns False on failure."""
+    from pgvector import HalfVector
+    from psycopg.types.json import Jsonb
+    
+    if not len(table):
+        return True
+    
+    columns = ', '.join(COPY_COLUMNS)
+    try:
+        with conn.cursor() as cur:
+            with cur.copy(f"COPY csec_content ({columns}) FROM STDIN WITH (FORMAT BINARY)") as copy:
+                copy.set_types(COPY_TYPES)
+                for *values, metadata, embedding in table.rows():
+                    copy.write_row((*values, Jsonb(metadata), HalfVector(embedding)))
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"  Error during COPY upload: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            # Connection already broken (e.g. pooler timeout); nothing to roll back
+            pass
+        return False
+
+
+def upload_worker(upload_queue: queue.Queue, supabase: 'Client', conn, failures: list):
+    """Upload chunk tables from the queue until a None sentinel arrives.
+    
+    A table that fails to upload is recorded in failures as (row count, exception)
+    and the queue keeps draining, so the producer never blocks on a stuck uploader.
+    """
+    while True:
+        table = upload_queue.get()
+        if table is None:
+            break
+        
         try:
-            supabase.table('csec_content').insert(batch).execute()
+            # Binary COPY when connected; REST for the rest of the run once COPY fails
+            if conn is not None and not copy_records(conn, table):
+                print("  Falling back to Supabase REST uploads")
+                conn = None
+            if conn is None:
+                upsert_records(supabase, table)
         except Exception as e:
-            print(f"  Error upserting batch: {e}")
-            # Try one by one
-            for record in batch:
-                try:
-                    supabase.table('csec_content').insert(record).execute()
-                except Exception as e2:
-                    print(f"  Error upserting record: {e2}")
+            print(f"  Error uploading {len(table)} rows: {e}")
+            failures.append((len(table), e))
+
+
+def enqueue_upload(upload_queue: queue.Queue, uploader: threading.Thread, table: Optional[ChunkTable]):
+    """Put a table (or the None sentinel) on the upload queue, failing if the uploader died."""
+    while True:
+        if not uploader.is_alive():
+            raise RuntimeError("Uploader thread exited unexpectedly; remaining rows were not uploaded")
+        try:
+            upload_queue.put(table, timeout=1)
+            return
+        except queue.Full:
+            continue
 
 
 def main():
@@ -399,7 +694,6 @@ def main():
     
     # Initialize
     supabase = get_supabase_client()
-    model = load_embedding_model()
     
     # Define data directories
     data_dir = project_root / 'data'
@@ -443,21 +737,62 @@ def main():
     else:
         print("Keeping existing content (non-interactive mode or --no-clear flag)")
     
-    # Process PDFs
-    all_records = []
-    
-    print("\nProcessing PDFs...")
-    for pdf_path, subject, content_type in tqdm(pdf_files, desc="Processing"):
-        tqdm.write(f"  {subject}: {pdf_path.name}")
-        records = process_pdf(pdf_path, subject, content_type, model)
-        all_records.extend(records)
-        tqdm.write(f"    Generated {len(records)} chunks")
-    
-    print(f"\nTotal records to upload: {len(all_records)}")
-    
-    # Upload to Supabase
-    print("\nUploading to Supabase...")
-    upsert_records(supabase, all_records)
+    # Pipeline: worker processes extract -> this process embeds -> uploader thread writes
+    print(f"\nProcessing PDFs with {INGEST_CONCURRENCY} worker processes...")
+    with ProcessPoolExecutor(max_workers=INGEST_CONCURRENCY, initializer=init_extract_worker) as executor:
+        # Submit before loading the model or starting the uploader, so workers are
+        # started (forked) from a process without model or uploader threads
+        futures = {executor.submit(extract_and_chunk, *pdf_file): pdf_file for pdf_file in pdf_files}
+        
+        # Workers extract while the model loads
+        model = load_embedding_model()
+        conn = get_postgres_connection()
+        print(f"\nUploading via {'Postgres binary COPY' if conn is not None else 'Supabase REST'}")
+        upload_queue = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        upload_failures = []
+        uploader = threading.Thread(
+            target=upload_worker,
+            args=(upload_queue, supabase, conn, upload_failures),
+            daemon=True
+        )
+        uploader.start()
+        
+        pending = []
+        pending_chunks = 0
+        total_records = 0
+        
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing"):
+            pdf_path, subject, content_type = futures[future]
+            chunks, topics, metadata = future.result()
+            tqdm.write(f"  {subject}: {pdf_path.name}")
+            tqdm.write(f"    Generated {len(chunks)} chunks")
+            pending.append((subject, content_type, chunks, topics, metadata))
+            pending_chunks += len(chunks)
+            
+            # Encode once enough chunks have accumulated, while workers keep extracting
+            if pending_chunks >= EMBED_FLUSH_SIZE:
+                table = embed_pending(model, pending)
+                total_records += len(table)
+                enqueue_upload(upload_queue, uploader, table)
+                pending = []
+                pending_chunks = 0
+    
+    if pending:
+        table = embed_pending(model, pending)
+        total_records += len(table)
+        enqueue_upload(upload_queue, uploader, table)
+    
+    # Wait for the uploader to drain
+    enqueue_upload(upload_queue, uploader, None)
+    uploader.join()
+    if conn is not None:
+        conn.close()
+    
+    if upload_failures:
+        failed_rows = sum(count for count, _ in upload_failures)
+        raise RuntimeError(
+            f"{failed_rows} of {total_records} rows failed to upload"
+        ) from upload_failures[0][1]
     
     # Summary
     print()
@@ -465,7 +800,7 @@ def main():
     print("Complete!")
     print("=" * 60)
     print(f"Processed: {len(pdf_files)} PDFs")
-    print(f"Generated: {len(all_records)} content chunks")
+    print(f"Generated: {total_records} content chunks")
     print(f"Embedding dimension: {EMBEDDING_DIMENSION}")
     print()
     print("Verification query:")
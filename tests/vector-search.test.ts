@@ -7,6 +7,7 @@ const mockRpc = jest.fn()
 const mockSelect = jest.fn()
 const mockInsert = jest.fn()
 const mockEq = jest.fn()
+const mockContains = jest.fn()
 const mockOrder = jest.fn()
 const mockSingle = jest.fn()
 
@@ -42,6 +43,11 @@ describe('VectorSearch', () => {
       single: mockSingle
     })
     mockEq.mockReturnValue({
+      eq: mockEq,
+      contains: mockContains,
+      order: mockOrder
+    })
+    mockContains.mockReturnValue({
       eq: mockEq,
       order: mockOrder
     })
@@ -136,12 +142,13 @@ describe('VectorSearch', () => {
       
       const mockEqChain = {
         eq: jest.fn().mockReturnThis(),
+        contains: jest.fn().mockReturnThis(),
         data: mockResults,
         error: null
       }
       mockRpc.mockReturnValue(mockEqChain)
 
-      await VectorSearch.searchSimilarContent(
+      const result = await VectorSearch.searchSimilarContent(
         'test query',
         'mathematics',
         'Algebra',
@@ -154,6 +161,9 @@ describe('VectorSearch', () => {
         match_threshold: 0.7,
         match_count: 10
       })
+      expect(mockEqChain.eq).toHaveBeenCalledWith('subject', 'mathematics')
+      expect(mockEqChain.contains).toHaveBeenCalledWith('topics', ['Algebra'])
+      expect(result).toEqual(mockResults)
     })
 
     it('should throw error on search failure', async () => {
@@ -185,6 +195,7 @@ describe('VectorSearch', () => {
 
       expect(mockFrom).toHaveBeenCalledWith('csec_content')
       expect(mockSelect).toHaveBeenCalledWith('*')
+      expect(mockContains).toHaveBeenCalledWith('topics', ['Algebra'])
       expect(result).toEqual(mockContent)
     })
   })
@@ -218,17 +229,17 @@ describe('VectorSearch', () => {
   describe('getTopics', () => {
     it('should retrieve unique topics for a subject', async () => {
       const mockData = [
-        { topic: 'Algebra' },
-        { topic: 'Geometry' },
-        { topic: 'Algebra' }
+        { topics: ['Geometry'] },
+        { topics: ['Algebra', 'Geometry'] },
+        { topics: ['Algebra'] }
       ]
 
-      mockOrder.mockReturnValue({ data: mockData, error: null })
+      mockEq.mockReturnValueOnce({ data: mockData, error: null })
 
       const topics = await VectorSearch.getTopics('mathematics')
 
       expect(mockFrom).toHaveBeenCalledWith('csec_content')
-      expect(mockSelect).toHaveBeenCalledWith('topic')
+      expect(mockSelect).toHaveBeenCalledWith('topics')
       expect(topics).toEqual(['Algebra', 'Geometry'])
     })
   })